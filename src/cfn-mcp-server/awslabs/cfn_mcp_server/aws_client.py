@@ -12,17 +12,37 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import botocore.config
 import sys
+import threading
 from awslabs.cfn_mcp_server.errors import ClientError
 from boto3 import Session
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache, partial
 from os import environ
 
 
+# Tool calls can run concurrently, so allow more than botocore's default of 10 connections
+MAX_POOL_CONNECTIONS = int(environ.get('AWS_MAX_POOL_CONNECTIONS', '50'))
+
 session = Session(profile_name=environ.get('AWS_PROFILE'))
 session_config = botocore.config.Config(
     user_agent_extra='cfn-mcp-server/1.0.0',
+    max_pool_connections=MAX_POOL_CONNECTIONS,
+    # Pooled connections can sit idle between long polls, keep-alive stops them being dropped
+    tcp_keepalive=True,
+    # Fail over to a retry quickly when an endpoint is unreachable instead of botocore's 60 seconds
+    connect_timeout=5,
+    # Standard mode retries throttling and transient errors with backoff. CloudControl mutations
+    # carry an auto-generated ClientToken that is reused on retry, so retried calls are idempotent.
+    # Setting the mode here takes precedence over AWS_RETRY_MODE and the profile's retry_mode.
+    retries={'mode': 'standard'},
 )
+# Blocking boto3 calls run on this pool, sized to match the connection pool so neither side
+# becomes the bottleneck. The event loop's default executor is capped at min(32, cpu_count + 4).
+executor_size = int(environ.get('AWS_THREAD_POOL_SIZE') or MAX_POOL_CONNECTIONS)
+executor = ThreadPoolExecutor(max_workers=executor_size, thread_name_prefix='cfn-mcp-io')
 
 
 def get_aws_client(service_name, region_name=None):
@@ -51,14 +71,7 @@ def get_aws_client(service_name, region_name=None):
 
     # Credential detection and client creation
     try:
-        print(
-            f'Creating new {service_name} client for region {region_name} with auto-detected credentials'
-        )
-        client = session.client(service_name, region_name=region_name, config=session_config)
-
-        print('Created client for service with credentials')
-        return client
-
+        return _create_client(service_name, region_name)
     except Exception as e:
         print(f'Error creating {service_name} client: {str(e)}', file=sys.stderr)
         if 'ExpiredToken' in str(e):
@@ -69,3 +82,37 @@ def get_aws_client(service_name, region_name=None):
             )
         else:
             raise ClientError('Got an error when loading your client.')
+
+
+@lru_cache(maxsize=None)
+def _create_client(service_name, region_name):
+    """Create a client once per service and region, failures are not cached and will be retried."""
+    print(
+        f'Creating new {service_name} client for region {region_name} with auto-detected credentials',
+        file=sys.stderr,
+    )
+    client = session.client(service_name, region_name=region_name, config=session_config)
+
+    print('Created client for service with credentials', file=sys.stderr)
+    return client
+
+
+async def run_boto(fn, *args, **kwargs):
+    """Run a blocking boto3 call on the shared executor so it does not block the event loop.
+
+    This uses run_in_executor directly rather than asyncio.to_thread, which copies the current
+    contextvars context on every call even though boto3 does not read it.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+
+
+def warm_executor():
+    """Start every executor thread up front so the first burst of tool calls does not pay for it.
+
+    ThreadPoolExecutor only starts a thread when no idle one is available, so no-op tasks would
+    mostly be picked up by the first few threads. Each warm-up task instead waits on a barrier
+    that is only released once all of them are running, which forces the pool to fill.
+    """
+    barrier = threading.Barrier(executor_size)
+    wait([executor.submit(barrier.wait, 5) for _ in range(executor_size)])
@@ -12,9 +12,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import json
+import orjson
+import random
+import time
+from awslabs.cfn_mcp_server.aws_client import run_boto
 from awslabs.cfn_mcp_server.errors import ClientError
 
 
+def to_json(payload) -> str:
+    """Serialize a CloudControl document (DesiredState, PatchDocument) to a JSON string."""
+    try:
+        return orjson.dumps(payload).decode()
+    except TypeError:
+        # orjson rejects some valid documents, such as integers wider than 64 bits
+        return json.dumps(payload, separators=(',', ':'))
+
+
+def from_json(document: str | bytes):
+    """Parse a JSON document such as a resource schema, raises json.JSONDecodeError if invalid."""
+    return orjson.loads(document)
+
+
+_PATCH_OPERATIONS = frozenset(('add', 'remove', 'replace', 'move', 'copy', 'test'))
+_VALUE_OPERATIONS = frozenset(('add', 'replace', 'test'))
+_FROM_OPERATIONS = frozenset(('move', 'copy'))
+
+
 def validate_patch(patch_document: list):
     """A best effort check that makes sure that the format of a patch document is valid before sending it to CloudControl."""
     for patch_op in patch_document:
@@ -22,40 +47,49 @@ def validate_patch(patch_document: list):
             raise ClientError('Each patch operation must be a dictionary')
         if 'op' not in patch_op:
             raise ClientError("Each patch operation must include an 'op' field")
-        if patch_op['op'] not in ['add', 'remove', 'replace', 'move', 'copy', 'test']:
+        op = patch_op['op']
+        if not isinstance(op, str) or op not in _PATCH_OPERATIONS:
             raise ClientError(
-                f"Operation '{patch_op['op']}' is not supported. Must be one of: add, remove, replace, move, copy, test"
+                f"Operation '{op}' is not supported. Must be one of: add, remove, replace, move, copy, test"
             )
         if 'path' not in patch_op:
             raise ClientError("Each patch operation must include a 'path' field")
         # Value is required for add, replace, and test operations
-        if patch_op['op'] in ['add', 'replace', 'test'] and 'value' not in patch_op:
-            raise ClientError(f"The '{patch_op['op']}' operation requires a 'value' field")
+        if op in _VALUE_OPERATIONS and 'value' not in patch_op:
+            raise ClientError(f"The '{op}' operation requires a 'value' field")
         # From is required for move and copy operations
-        if patch_op['op'] in ['move', 'copy'] and 'from' not in patch_op:
-            raise ClientError(f"The '{patch_op['op']}' operation requires a 'from' field")
+        if op in _FROM_OPERATIONS and 'from' not in patch_op:
+            raise ClientError(f"The '{op}' operation requires a 'from' field")
+
+
+# statuses after which a resource request will not change anymore
+_TERMINAL_STATUSES = frozenset(('SUCCESS', 'FAILED', 'CANCEL_COMPLETE'))
+_FAILED_HOOK_STATUSES = frozenset(('HOOK_COMPLETE_FAILED', 'HOOK_FAILED'))
+# optional ProgressEvent fields and the keys they are returned under
+_OPTIONAL_FIELDS = (
+    ('Identifier', 'identifier'),
+    ('ResourceModel', 'resource_info'),
+    ('ErrorCode', 'error_code'),
+    ('EventTime', 'event_time'),
+    ('RetryAfter', 'retry_after'),
+)
 
 
 def progress_event(response_event, hooks_events) -> dict[str, str]:
     """Map a CloudControl API response to a standard output format for the MCP."""
+    get = response_event.get
+    status = response_event['OperationStatus']
     response = {
-        'status': response_event['OperationStatus'],
+        'status': status,
         'resource_type': response_event['TypeName'],
-        'is_complete': response_event['OperationStatus'] == 'SUCCESS'
-        or response_event['OperationStatus'] == 'FAILED',
+        'is_complete': status in _TERMINAL_STATUSES,
         'request_token': response_event['RequestToken'],
     }
 
-    if response_event.get('Identifier', None):
-        response['identifier'] = response_event['Identifier']
-    if response_event.get('ResourceModel', None):
-        response['resource_info'] = response_event['ResourceModel']
-    if response_event.get('ErrorCode', None):
-        response['error_code'] = response_event['ErrorCode']
-    if response_event.get('EventTime', None):
-        response['event_time'] = response_event['EventTime']
-    if response_event.get('RetryAfter', None):
-        response['retry_after'] = response_event['RetryAfter']
+    for field, key in _OPTIONAL_FIELDS:
+        value = get(field)
+        if value:
+            response[key] = value
 
     # CloudControl returns a list of hooks events which may also contain a message which should
     # take precedent over the status message returned from CloudControl directly
@@ -64,14 +98,50 @@ def progress_event(response_event, hooks_events) -> dict[str, str]:
         failed_hook_event_messages = (
             hook_event['HookStatusMessage']
             for hook_event in hooks_events
-            if hook_event.get('HookStatus', None) == 'HOOK_COMPLETE_FAILED'
-            or hook_event.get('HookStatus', None) == 'HOOK_FAILED'
+            if hook_event.get('HookStatus') in _FAILED_HOOK_STATUSES
         )
         hooks_status_message = next(failed_hook_event_messages, None)
 
     if hooks_status_message:
         response['status_message'] = hooks_status_message
-    elif response_event.get('StatusMessage', None):
-        response['status_message'] = response_event['StatusMessage']
+    else:
+        status_message = get('StatusMessage')
+        if status_message:
+            response['status_message'] = status_message
 
     return response
+
+
+_INITIAL_POLL_INTERVAL = 0.25
+_MAX_POLL_INTERVAL = 10.0
+# fraction of the interval added as random jitter so concurrent waiters do not poll in lockstep
+_POLL_JITTER = 0.1
+
+
+async def wait_for_request(
+    cloudcontrol_client,
+    request_token: str,
+    timeout: float,
+    initial_interval: float = _INITIAL_POLL_INTERVAL,
+    max_interval: float = _MAX_POLL_INTERVAL,
+) -> dict:
+    """Poll a CloudControl request until it reaches a terminal status or the timeout elapses.
+
+    Polls start a quarter of a second apart and back off geometrically up to ten seconds with a
+    little jitter, so short operations are picked up quickly without hammering the API during long
+    ones. The last get_resource_request_status response is returned, which may still be in
+    progress on timeout.
+    """
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    while True:
+        response = await run_boto(
+            cloudcontrol_client.get_resource_request_status, RequestToken=request_token
+        )
+        remaining = deadline - time.monotonic()
+        if response['ProgressEvent']['OperationStatus'] in _TERMINAL_STATUSES or remaining <= 0:
+            return response
+
+        jitter = random.uniform(0, interval * _POLL_JITTER)
+        await asyncio.sleep(min(interval + jitter, remaining))
+        interval = min(interval * 2, max_interval)
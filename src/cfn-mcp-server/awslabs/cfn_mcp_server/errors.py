@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from functools import wraps
+
 
 def handle_aws_api_error(e: Exception) -> Exception:
     """Handle common AWS API errors and return standardized error responses.
@@ -92,3 +94,21 @@ class ServerError(Exception):
         super().__init__('An internal error occurred while processing your request')
         print(log)
         self.type = 'server'
+
+
+def map_aws_api_errors(fn):
+    """Decorate a tool so that exceptions raised by AWS API calls are mapped with handle_aws_api_error.
+
+    Errors which are already a ClientError or ServerError, such as input validation, pass through unchanged.
+    """
+
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except (ClientError, ServerError):
+            raise
+        except Exception as e:
+            raise handle_aws_api_error(e)
+
+    return wrapper
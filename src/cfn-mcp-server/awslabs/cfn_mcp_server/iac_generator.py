@@ -15,7 +15,7 @@
 """CloudFormation IaC Generator tool implementation."""
 
 import os
-from awslabs.cfn_mcp_server.aws_client import get_aws_client
+from awslabs.cfn_mcp_server.aws_client import get_aws_client, run_boto
 from awslabs.cfn_mcp_server.errors import ClientError, handle_aws_api_error
 from typing import Dict, List, Optional
 
@@ -98,16 +98,8 @@ async def _start_template_generation(
     Returns:
         A dictionary containing information about the template generation process
     """
-    # Prepare parameters for the API call
-    params = {
-        'GeneratedTemplateName': template_name,
-        'TemplateConfiguration': {
-            'DeletionPolicy': deletion_policy,
-            'UpdateReplacePolicy': update_replace_policy,
-        },
-    }
-
-    # Add resources if provided
+    # Resources are optional, only send them when provided
+    extra_params = {}
     if resources:
         resource_identifiers = []
         for resource in resources:
@@ -121,11 +113,19 @@ async def _start_template_generation(
                     'ResourceIdentifier': resource['ResourceIdentifier'],
                 }
             )
-        params['Resources'] = resource_identifiers
+        extra_params['Resources'] = resource_identifiers
 
     # Call the API
     try:
-        response = cfn_client.create_generated_template(**params)
+        response = await run_boto(
+            cfn_client.create_generated_template,
+            GeneratedTemplateName=template_name,
+            TemplateConfiguration={
+                'DeletionPolicy': deletion_policy,
+                'UpdateReplacePolicy': update_replace_policy,
+            },
+            **extra_params,
+        )
         return {
             'status': 'INITIATED',
             'template_id': response['GeneratedTemplateId'],
@@ -151,7 +151,9 @@ async def _handle_existing_template(
     """
     # Check the status of the template generation process
     try:
-        status_response = cfn_client.describe_generated_template(GeneratedTemplateName=template_id)
+        status_response = await run_boto(
+            cfn_client.describe_generated_template, GeneratedTemplateName=template_id
+        )
 
         status = status_response['Status']
 
@@ -164,8 +166,10 @@ async def _handle_existing_template(
             }
 
         # If the template is complete, retrieve it
-        template_response = cfn_client.get_generated_template(
-            GeneratedTemplateName=template_id, Format=output_format
+        template_response = await run_boto(
+            cfn_client.get_generated_template,
+            GeneratedTemplateName=template_id,
+            Format=output_format,
         )
 
         template_content = template_response['TemplateBody']
@@ -14,7 +14,8 @@
 
 import json
 import os
-from awslabs.cfn_mcp_server.aws_client import get_aws_client
+from awslabs.cfn_mcp_server.aws_client import get_aws_client, run_boto
+from awslabs.cfn_mcp_server.cloud_control_utils import from_json
 from awslabs.cfn_mcp_server.errors import ClientError
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -50,8 +51,7 @@ class SchemaManager:
         """Load schema metadata from file or create if it doesn't exist."""
         if self.metadata_file.exists():
             try:
-                with open(self.metadata_file, 'r') as f:
-                    return json.load(f)
+                return from_json(self.metadata_file.read_bytes())
             except json.JSONDecodeError:
                 print('Corrupted metadata file. Creating new one.')
 
@@ -66,20 +66,24 @@ class SchemaManager:
 
     def _load_cached_schemas(self):
         """Load all cached schemas into the registry."""
+        loaded = 0
         for schema_file in self.cache_dir.glob('*.json'):
             if schema_file.name == SCHEMA_METADATA_FILE:
                 continue
 
             try:
-                with open(schema_file, 'r') as f:
-                    schema = json.load(f)
-                    if 'typeName' in schema:
-                        resource_type = schema['typeName']
-                        self.schema_registry[resource_type] = schema
-                        print(f'Loaded schema for {resource_type} from cache')
+                schema = from_json(schema_file.read_bytes())
+                if 'typeName' in schema:
+                    resource_type = schema['typeName']
+                    self.schema_registry[resource_type] = schema
+                    loaded += 1
             except (json.JSONDecodeError, IOError) as e:
                 print(f'Error loading schema from {schema_file}: {str(e)}')
 
+        # A single summary line instead of one per schema, the cache grows with every type used
+        if loaded:
+            print(f'Loaded {loaded} schemas from cache')
+
     async def get_schema(self, resource_type: str, region: str | None = None) -> dict:
         """Get schema for a resource type, downloading it if necessary."""
         # Check if schema is in registry and not forced to refresh
@@ -132,9 +136,11 @@ class SchemaManager:
         try:
             print(f'Downloading schema for {resource_type} using CloudFormation API')
             cfn_client = get_aws_client('cloudformation', region)
-            resp = cfn_client.describe_type(Type='RESOURCE', TypeName=resource_type)
+            resp = await run_boto(
+                cfn_client.describe_type, Type='RESOURCE', TypeName=resource_type
+            )
             schema_str = resp['Schema']
-            spec = json.loads(schema_str)
+            spec = from_json(schema_str)
 
             # Save schema to cache
             schema_file = self.cache_dir / f'{resource_type.replace("::", "_")}.json'
@@ -151,16 +157,23 @@ class SchemaManager:
             with open(self.metadata_file, 'w') as f:
                 json.dump(self.metadata, f, indent=2)
 
+            # Keep the schema in memory so later calls skip the describe_type round trip
+            self.schema_registry[resource_type] = spec
+
             print(f'Processed and cached schema for {resource_type}')
             return spec
         except Exception as e:
             raise ClientError(f'Error downloading the schema for {resource_type}: {str(e)}')
 
 
-_schema_manager_instance = SchemaManager()
+# created on first use so that importing the server does not read every cached schema from disk
+_schema_manager_instance: SchemaManager | None = None
 
 
 # used to load a single instance of the schema manager
 def schema_manager() -> SchemaManager:
     """Loads a singleton of the resource."""
+    global _schema_manager_instance
+    if _schema_manager_instance is None:
+        _schema_manager_instance = SchemaManager()
     return _schema_manager_instance
@@ -15,15 +15,20 @@
 """awslabs CFN MCP Server implementation."""
 
 import argparse
-import json
-from awslabs.cfn_mcp_server.aws_client import get_aws_client
-from awslabs.cfn_mcp_server.cloud_control_utils import progress_event, validate_patch
+from awslabs.cfn_mcp_server.aws_client import executor, get_aws_client, run_boto, warm_executor
+from awslabs.cfn_mcp_server.cloud_control_utils import (
+    progress_event,
+    to_json,
+    validate_patch,
+    wait_for_request,
+)
 from awslabs.cfn_mcp_server.context import Context
-from awslabs.cfn_mcp_server.errors import ClientError, handle_aws_api_error
+from awslabs.cfn_mcp_server.errors import ClientError, map_aws_api_errors
 from awslabs.cfn_mcp_server.iac_generator import create_template as create_template_impl
 from awslabs.cfn_mcp_server.schema_manager import schema_manager
 from mcp.server.fastmcp import FastMCP
 from pydantic import Field
+from typing import Annotated
 
 
 mcp = FastMCP(
@@ -35,18 +40,29 @@ mcp = FastMCP(
     1. Read and List all of your AWS resources by the CloudFormation type name (e.g. AWS::S3::Bucket)
     2. Create/Update/Delete your AWS resources
     """,
-    dependencies=['pydantic', 'loguru', 'boto3', 'botocore'],
+    dependencies=['pydantic', 'loguru', 'boto3', 'botocore', 'orjson'],
 )
 
 
+def _ensure_not_readonly():
+    """Reject a mutating operation if the server was started with --readonly."""
+    if Context.readonly_mode():
+        raise ClientError(
+            'You have configured this tool in readonly mode. To make this change you will have to update your configuration.'
+        )
+
+
 @mcp.tool()
 async def get_resource_schema_information(
-    resource_type: str = Field(
-        description='The AWS resource type (e.g., "AWS::S3::Bucket", "AWS::RDS::DBInstance")'
-    ),
-    region: str | None = Field(
-        description='The AWS region that the operation should be performed in', default=None
-    ),
+    resource_type: Annotated[
+        str,
+        Field(
+            description='The AWS resource type (e.g., "AWS::S3::Bucket", "AWS::RDS::DBInstance")'
+        ),
+    ],
+    region: Annotated[
+        str | None, Field(description='The AWS region that the operation should be performed in')
+    ] = None,
 ) -> dict:
     """Get schema information for an AWS resource.
 
@@ -65,13 +81,17 @@ async def get_resource_schema_information(
 
 
 @mcp.tool()
+@map_aws_api_errors
 async def list_resources(
-    resource_type: str = Field(
-        description='The AWS resource type (e.g., "AWS::S3::Bucket", "AWS::RDS::DBInstance")'
-    ),
-    region: str | None = Field(
-        description='The AWS region that the operation should be performed in', default=None
-    ),
+    resource_type: Annotated[
+        str,
+        Field(
+            description='The AWS resource type (e.g., "AWS::S3::Bucket", "AWS::RDS::DBInstance")'
+        ),
+    ],
+    region: Annotated[
+        str | None, Field(description='The AWS region that the operation should be performed in')
+    ] = None,
 ) -> list:
     """List AWS resources of a specified type.
 
@@ -88,28 +108,36 @@ async def list_resources(
     cloudcontrol = get_aws_client('cloudcontrol', region)
     paginator = cloudcontrol.get_paginator('list_resources')
 
-    results = []
     page_iterator = paginator.paginate(TypeName=resource_type)
-    try:
-        for page in page_iterator:
-            results.extend(page['ResourceDescriptions'])
-    except Exception as e:
-        raise handle_aws_api_error(e)
-
-    return [response['Identifier'] for response in results]
+    # Pages are chained by NextToken, so walk them all in one executor call and only keep
+    # the identifiers rather than every page and its resource properties
+    return await run_boto(
+        lambda: [
+            description['Identifier']
+            for page in page_iterator
+            for description in page['ResourceDescriptions']
+        ]
+    )
 
 
 @mcp.tool()
+@map_aws_api_errors
 async def get_resource(
-    resource_type: str = Field(
-        description='The AWS resource type (e.g., "AWS::S3::Bucket", "AWS::RDS::DBInstance")'
-    ),
-    identifier: str = Field(
-        description='The primary identifier of the resource to get (e.g., bucket name for S3 buckets)'
-    ),
-    region: str | None = Field(
-        description='The AWS region that the operation should be performed in', default=None
-    ),
+    resource_type: Annotated[
+        str,
+        Field(
+            description='The AWS resource type (e.g., "AWS::S3::Bucket", "AWS::RDS::DBInstance")'
+        ),
+    ],
+    identifier: Annotated[
+        str,
+        Field(
+            description='The primary identifier of the resource to get (e.g., bucket name for S3 buckets)'
+        ),
+    ],
+    region: Annotated[
+        str | None, Field(description='The AWS region that the operation should be performed in')
+    ] = None,
 ) -> dict:
     """Get details of a specific AWS resource.
 
@@ -132,30 +160,36 @@ async def get_resource(
         raise ClientError('Please provide a resource identifier')
 
     cloudcontrol = get_aws_client('cloudcontrol', region)
-    try:
-        result = cloudcontrol.get_resource(TypeName=resource_type, Identifier=identifier)
-        return {
-            'identifier': result['ResourceDescription']['Identifier'],
-            'properties': result['ResourceDescription']['Properties'],
-        }
-    except Exception as e:
-        raise handle_aws_api_error(e)
+    result = await run_boto(
+        cloudcontrol.get_resource, TypeName=resource_type, Identifier=identifier
+    )
+    return {
+        'identifier': result['ResourceDescription']['Identifier'],
+        'properties': result['ResourceDescription']['Properties'],
+    }
 
 
 @mcp.tool()
+@map_aws_api_errors
 async def update_resource(
-    resource_type: str = Field(
-        description='The AWS resource type (e.g., "AWS::S3::Bucket", "AWS::RDS::DBInstance")'
-    ),
-    identifier: str = Field(
-        description='The primary identifier of the resource to get (e.g., bucket name for S3 buckets)'
-    ),
-    patch_document: list = Field(
-        description='A list of RFC 6902 JSON Patch operations to apply', default=[]
-    ),
-    region: str | None = Field(
-        description='The AWS region that the operation should be performed in', default=None
-    ),
+    resource_type: Annotated[
+        str,
+        Field(
+            description='The AWS resource type (e.g., "AWS::S3::Bucket", "AWS::RDS::DBInstance")'
+        ),
+    ],
+    identifier: Annotated[
+        str,
+        Field(
+            description='The primary identifier of the resource to get (e.g., bucket name for S3 buckets)'
+        ),
+    ],
+    patch_document: Annotated[
+        list, Field(description='A list of RFC 6902 JSON Patch operations to apply')
+    ] = [],
+    region: Annotated[
+        str | None, Field(description='The AWS region that the operation should be performed in')
+    ] = None,
 ) -> dict:
     """Update an AWS resource.
 
@@ -186,37 +220,38 @@ async def update_resource(
     if not patch_document:
         raise ClientError('Please provide a patch document for the update')
 
-    if Context.readonly_mode():
-        raise ClientError(
-            'You have configured this tool in readonly mode. To make this change you will have to update your configuration.'
-        )
+    _ensure_not_readonly()
 
     validate_patch(patch_document)
     cloudcontrol_client = get_aws_client('cloudcontrol', region)
 
     # Convert patch document to JSON string for the API
-    patch_document_str = json.dumps(patch_document)
+    patch_document_str = to_json(patch_document)
 
     # Update the resource
-    try:
-        response = cloudcontrol_client.update_resource(
-            TypeName=resource_type, Identifier=identifier, PatchDocument=patch_document_str
-        )
-    except Exception as e:
-        raise handle_aws_api_error(e)
+    response = await run_boto(
+        cloudcontrol_client.update_resource,
+        TypeName=resource_type,
+        Identifier=identifier,
+        PatchDocument=patch_document_str,
+    )
 
     return progress_event(response['ProgressEvent'], None)
 
 
 @mcp.tool()
+@map_aws_api_errors
 async def create_resource(
-    resource_type: str = Field(
-        description='The AWS resource type (e.g., "AWS::S3::Bucket", "AWS::RDS::DBInstance")'
-    ),
-    properties: dict = Field(description='A dictionary of properties for the resource'),
-    region: str | None = Field(
-        description='The AWS region that the operation should be performed in', default=None
-    ),
+    resource_type: Annotated[
+        str,
+        Field(
+            description='The AWS resource type (e.g., "AWS::S3::Bucket", "AWS::RDS::DBInstance")'
+        ),
+    ],
+    properties: Annotated[dict, Field(description='A dictionary of properties for the resource')],
+    region: Annotated[
+        str | None, Field(description='The AWS region that the operation should be performed in')
+    ] = None,
 ) -> dict:
     """Create an AWS resource.
 
@@ -243,33 +278,36 @@ async def create_resource(
     if not properties:
         raise ClientError('Please provide the properties for the desired resource')
 
-    if Context.readonly_mode():
-        raise ClientError(
-            'You have configured this tool in readonly mode. To make this change you will have to update your configuration.'
-        )
+    _ensure_not_readonly()
 
     cloudcontrol_client = get_aws_client('cloudcontrol', region)
-    try:
-        response = cloudcontrol_client.create_resource(
-            TypeName=resource_type, DesiredState=json.dumps(properties)
-        )
-    except Exception as e:
-        raise handle_aws_api_error(e)
+    response = await run_boto(
+        cloudcontrol_client.create_resource,
+        TypeName=resource_type,
+        DesiredState=to_json(properties),
+    )
 
     return progress_event(response['ProgressEvent'], None)
 
 
 @mcp.tool()
+@map_aws_api_errors
 async def delete_resource(
-    resource_type: str = Field(
-        description='The AWS resource type (e.g., "AWS::S3::Bucket", "AWS::RDS::DBInstance")'
-    ),
-    identifier: str = Field(
-        description='The primary identifier of the resource to get (e.g., bucket name for S3 buckets)'
-    ),
-    region: str | None = Field(
-        description='The AWS region that the operation should be performed in', default=None
-    ),
+    resource_type: Annotated[
+        str,
+        Field(
+            description='The AWS resource type (e.g., "AWS::S3::Bucket", "AWS::RDS::DBInstance")'
+        ),
+    ],
+    identifier: Annotated[
+        str,
+        Field(
+            description='The primary identifier of the resource to get (e.g., bucket name for S3 buckets)'
+        ),
+    ],
+    region: Annotated[
+        str | None, Field(description='The AWS region that the operation should be performed in')
+    ] = None,
 ) -> dict:
     """Delete an AWS resource.
 
@@ -295,36 +333,47 @@ async def delete_resource(
     if not identifier:
         raise ClientError('Please provide a resource identifier')
 
-    if Context.readonly_mode():
-        raise ClientError(
-            'You have configured this tool in readonly mode. To make this change you will have to update your configuration.'
-        )
+    _ensure_not_readonly()
 
     cloudcontrol_client = get_aws_client('cloudcontrol', region)
-    try:
-        response = cloudcontrol_client.delete_resource(
-            TypeName=resource_type, Identifier=identifier
-        )
-    except Exception as e:
-        raise handle_aws_api_error(e)
+    response = await run_boto(
+        cloudcontrol_client.delete_resource, TypeName=resource_type, Identifier=identifier
+    )
 
     return progress_event(response['ProgressEvent'], None)
 
 
 @mcp.tool()
+@map_aws_api_errors
 async def get_resource_request_status(
-    request_token: str = Field(
-        description='The request_token returned from the long running operation'
-    ),
-    region: str | None = Field(
-        description='The AWS region that the operation should be performed in', default=None
-    ),
+    request_token: Annotated[
+        str, Field(description='The request_token returned from the long running operation')
+    ],
+    region: Annotated[
+        str | None, Field(description='The AWS region that the operation should be performed in')
+    ] = None,
+    wait_for_completion: Annotated[
+        bool,
+        Field(
+            description='Keep polling the request until it completes instead of returning the current status'
+        ),
+    ] = False,
+    timeout: Annotated[
+        int,
+        Field(
+            ge=0,
+            le=900,
+            description='The maximum number of seconds to wait when wait_for_completion is set',
+        ),
+    ] = 300,
 ) -> dict:
     """Get the status of a long running operation with the request token.
 
     Args:
         request_token: The request_token returned from the long running operation
         region: AWS region to use (e.g., "us-east-1", "us-west-2")
+        wait_for_completion: Poll until the request completes, backing off between checks
+        timeout: The maximum number of seconds to wait when wait_for_completion is set
 
     Returns:
         Detailed information about the request status structured as
@@ -343,44 +392,55 @@ async def get_resource_request_status(
         raise ClientError('Please provide a request token to track the request')
 
     cloudcontrol_client = get_aws_client('cloudcontrol', region)
-    try:
-        response = cloudcontrol_client.get_resource_request_status(
+    if wait_for_completion:
+        response = await wait_for_request(cloudcontrol_client, request_token, timeout)
+    else:
+        response = await run_boto(
+            cloudcontrol_client.get_resource_request_status,
             RequestToken=request_token,
         )
-    except Exception as e:
-        raise handle_aws_api_error(e)
 
     return progress_event(response['ProgressEvent'], response.get('HooksProgressEvent', None))
 
 
 @mcp.tool()
 async def create_template(
-    template_name: str | None = Field(None, description='Name for the generated template'),
-    resources: list | None = Field(
-        None,
-        description="List of resources to include in the template, each with 'ResourceType' and 'ResourceIdentifier'",
-    ),
-    output_format: str = Field(
-        'YAML', description='Output format for the template (JSON or YAML)'
-    ),
-    deletion_policy: str = Field(
-        'RETAIN',
-        description='Default DeletionPolicy for resources in the template (RETAIN, DELETE, or SNAPSHOT)',
-    ),
-    update_replace_policy: str = Field(
-        'RETAIN',
-        description='Default UpdateReplacePolicy for resources in the template (RETAIN, DELETE, or SNAPSHOT)',
-    ),
-    template_id: str | None = Field(
-        None,
-        description='ID of an existing template generation process to check status or retrieve template',
-    ),
-    save_to_file: str | None = Field(
-        None, description='Path to save the generated template to a file'
-    ),
-    region: str | None = Field(
-        description='The AWS region that the operation should be performed in', default=None
-    ),
+    template_name: Annotated[
+        str | None, Field(description='Name for the generated template')
+    ] = None,
+    resources: Annotated[
+        list | None,
+        Field(
+            description="List of resources to include in the template, each with 'ResourceType' and 'ResourceIdentifier'"
+        ),
+    ] = None,
+    output_format: Annotated[
+        str, Field(description='Output format for the template (JSON or YAML)')
+    ] = 'YAML',
+    deletion_policy: Annotated[
+        str,
+        Field(
+            description='Default DeletionPolicy for resources in the template (RETAIN, DELETE, or SNAPSHOT)'
+        ),
+    ] = 'RETAIN',
+    update_replace_policy: Annotated[
+        str,
+        Field(
+            description='Default UpdateReplacePolicy for resources in the template (RETAIN, DELETE, or SNAPSHOT)'
+        ),
+    ] = 'RETAIN',
+    template_id: Annotated[
+        str | None,
+        Field(
+            description='ID of an existing template generation process to check status or retrieve template'
+        ),
+    ] = None,
+    save_to_file: Annotated[
+        str | None, Field(description='Path to save the generated template to a file')
+    ] = None,
+    region: Annotated[
+        str | None, Field(description='The AWS region that the operation should be performed in')
+    ] = None,
 ) -> dict:
     """Create a CloudFormation template from existing resources using the IaC Generator API.
 
@@ -433,7 +493,13 @@ def main():
 
     args = parser.parse_args()
     Context.initialize(args.readonly)
-    mcp.run()
+    warm_executor()
+    try:
+        mcp.run()
+    finally:
+        # The interpreter joins the executor threads, running every queued call, before atexit
+        # hooks fire, so queued calls have to be cancelled here
+        executor.shutdown(cancel_futures=True)
 
 
 if __name__ == '__main__':
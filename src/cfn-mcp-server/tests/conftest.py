@@ -0,0 +1,36 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shared pytest configuration for the cfn MCP Server tests."""
+
+import asyncio
+import pytest
+from pytest_asyncio import is_async_test
+
+
+@pytest.fixture(scope='session')
+def event_loop_policy():
+    """Run the async tests on uvloop where it is installed, it is not available on Windows."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on one session-wide event loop rather than a new loop per test."""
+    session_loop = pytest.mark.asyncio(loop_scope='session')
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
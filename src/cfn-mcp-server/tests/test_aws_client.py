@@ -14,64 +14,128 @@
 """Tests for the cfn MCP Server."""
 
 import pytest
-from awslabs.cfn_mcp_server.aws_client import get_aws_client
+import threading
+from awslabs.cfn_mcp_server import aws_client
+from awslabs.cfn_mcp_server.aws_client import (
+    MAX_POOL_CONNECTIONS,
+    _create_client,
+    executor,
+    executor_size,
+    get_aws_client,
+    run_boto,
+    session_config,
+    warm_executor,
+)
 from awslabs.cfn_mcp_server.errors import ClientError
-from unittest.mock import patch
+from types import SimpleNamespace
+
+
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    """Make sure every test builds its own clients."""
+    _create_client.cache_clear()
+    yield
+    _create_client.cache_clear()
+
+
+@pytest.fixture
+def session_calls(monkeypatch):
+    """Replace the boto3 session with a stub that records every client it is asked for."""
+    calls = []
+
+    def client(*args, **kwargs):
+        calls.append((args, kwargs))
+        return object()
+
+    monkeypatch.setattr(aws_client, 'session', SimpleNamespace(client=client))
+    return calls
 
 
-@pytest.mark.asyncio
 class TestClient:
     """Tests on the aws_client module."""
 
-    @patch('awslabs.cfn_mcp_server.aws_client.session')
-    @patch('awslabs.cfn_mcp_server.aws_client.environ')
-    async def test_happy_path(self, mock_environ, mock_session):
+    @pytest.mark.parametrize(
+        ('region_name', 'aws_region', 'expected_region'),
+        [
+            pytest.param('us-west-2', 'eu-west-1', 'us-west-2', id='explicit_region'),
+            pytest.param(None, 'eu-west-1', 'eu-west-1', id='region_from_environment'),
+            pytest.param(None, None, 'us-east-1', id='default_region'),
+        ],
+    )
+    async def test_happy_path(
+        self, session_calls, monkeypatch, region_name, aws_region, expected_region
+    ):
         """Testing happy path."""
-        client = {}
-        mock_session.client.return_value = client
-
-        result = get_aws_client('cloudcontrol', 'us-east-1')
-
-        assert result == client
-
-    @patch('awslabs.cfn_mcp_server.aws_client.session')
-    @patch('awslabs.cfn_mcp_server.aws_client.environ')
-    async def test_happy_path_no_region(self, mock_environ, mock_session):
-        """Testing no region."""
-        client = {}
-        mock_session.client.return_value = client
-        mock_environ.get.return_value = 'us-east-1'
-
-        result = get_aws_client('cloudcontrol')
-
-        assert result == client
-
-    @patch('awslabs.cfn_mcp_server.aws_client.session')
-    @patch('awslabs.cfn_mcp_server.aws_client.environ')
-    async def test_expired_token(self, mock_environ, mock_session):
-        """Testing token is expired."""
-        mock_session.client.side_effect = Exception('ExpiredToken')
-        mock_environ.get.return_value = 'us-east-1'
-
-        with pytest.raises(ClientError):
-            get_aws_client('cloudcontrol')
-
-    @patch('awslabs.cfn_mcp_server.aws_client.session')
-    @patch('awslabs.cfn_mcp_server.aws_client.environ')
-    async def test_no_providers(self, mock_environ, mock_session):
-        """Testing no providers given."""
-        mock_session.client.side_effect = Exception('NoCredentialProviders')
-        mock_environ.get.return_value = 'us-east-1'
-
-        with pytest.raises(ClientError):
-            get_aws_client('cloudcontrol')
-
-    @patch('awslabs.cfn_mcp_server.aws_client.session')
-    @patch('awslabs.cfn_mcp_server.aws_client.environ')
-    async def test_other_error(self, mock_environ, mock_session):
-        """Testing error."""
-        mock_session.client.side_effect = Exception('UNRELATED')
-        mock_environ.get.return_value = 'us-east-1'
-
-        with pytest.raises(ClientError):
-            get_aws_client('cloudcontrol')
+        if aws_region:
+            monkeypatch.setenv('AWS_REGION', aws_region)
+        else:
+            monkeypatch.delenv('AWS_REGION', raising=False)
+
+        result = get_aws_client('cloudcontrol', region_name)
+
+        assert result is not None
+        assert session_calls == [
+            (('cloudcontrol',), {'region_name': expected_region, 'config': session_config})
+        ]
+
+    async def test_client_is_reused(self, session_calls):
+        """Testing clients are only created once per service and region."""
+        result1 = get_aws_client('cloudcontrol', 'us-east-1')
+        result2 = get_aws_client('cloudcontrol', 'us-east-1')
+        result3 = get_aws_client('cloudcontrol', 'us-west-2')
+
+        assert result1 is result2
+        assert result3 is not result1
+        assert len(session_calls) == 2
+
+    @pytest.mark.parametrize(
+        ('error', 'message'),
+        [
+            pytest.param('ExpiredToken', 'credentials have expired', id='expired_token'),
+            pytest.param('NoCredentialProviders', 'No AWS credentials found', id='no_providers'),
+            pytest.param('UNRELATED', 'Got an error when loading your client', id='other_error'),
+        ],
+    )
+    async def test_client_error(self, monkeypatch, error, message):
+        """Testing errors creating the client are mapped."""
+
+        def client(*args, **kwargs):
+            raise Exception(error)
+
+        monkeypatch.setattr(aws_client, 'session', SimpleNamespace(client=client))
+
+        with pytest.raises(ClientError, match=message):
+            get_aws_client('cloudcontrol', 'us-east-1')
+
+    async def test_pool_size(self):
+        """Testing the connection pool is sized for concurrent tool calls and kept alive."""
+        assert session_config.max_pool_connections == MAX_POOL_CONNECTIONS == 50  # pyright: ignore[reportAttributeAccessIssue]
+        assert session_config.tcp_keepalive is True  # pyright: ignore[reportAttributeAccessIssue]
+        assert session_config.connect_timeout == 5  # pyright: ignore[reportAttributeAccessIssue]
+
+    async def test_retry_mode(self):
+        """Testing transient errors are retried with the standard retry mode."""
+        assert session_config.retries == {'mode': 'standard'}  # pyright: ignore[reportAttributeAccessIssue]
+
+    async def test_thread_pool_size(self):
+        """Testing the thread pool matches the connection pool by default."""
+        assert executor_size == MAX_POOL_CONNECTIONS
+        assert executor._max_workers == executor_size
+
+    async def test_run_boto(self):
+        """Testing blocking calls are run off the event loop thread."""
+
+        def blocking_call(value, suffix=''):
+            return value + suffix, threading.current_thread()
+
+        result, thread = await run_boto(blocking_call, 'value', suffix='!')
+
+        assert result == 'value!'
+        assert thread.name.startswith('cfn-mcp-io')
+
+    async def test_warm_executor(self):
+        """Testing every executor thread is started by the warm up."""
+        warm_executor()
+
+        threads = {thread.name for thread in threading.enumerate()}
+        assert len({name for name in threads if name.startswith('cfn-mcp-io')}) == executor_size
@@ -13,12 +13,20 @@
 # limitations under the License.
 """Tests for the cfn MCP Server."""
 
+import json
 import pytest
-from awslabs.cfn_mcp_server.cloud_control_utils import progress_event, validate_patch
+from awslabs.cfn_mcp_server import cloud_control_utils
+from awslabs.cfn_mcp_server.cloud_control_utils import (
+    from_json,
+    progress_event,
+    to_json,
+    validate_patch,
+    wait_for_request,
+)
 from awslabs.cfn_mcp_server.errors import ClientError
+from unittest.mock import AsyncMock, MagicMock, patch
 
 
-@pytest.mark.asyncio
 class TestUtils:
     """Tests on the cloud_control_utils module."""
 
@@ -41,6 +49,11 @@ class TestUtils:
         with pytest.raises(ClientError):
             validate_patch([{'op': 'invalid'}])
 
+    async def test_patch_with_non_string_operation(self):
+        """Testing an unhashable operation is rejected as unsupported."""
+        with pytest.raises(ClientError, match="Operation '\\['add'\\]' is not supported"):
+            validate_patch([{'op': ['add'], 'path': '/property'}])
+
     async def test_patch_with_invalid_shape_4(self):
         """Testing no path."""
         with pytest.raises(ClientError):
@@ -139,6 +152,23 @@ class TestUtils:
 
         assert progress_event(request, None) == response
 
+    async def test_progress_event_cancel_complete(self):
+        """Testing a finished cancellation is reported as complete."""
+        request = {
+            'OperationStatus': 'CANCEL_COMPLETE',
+            'TypeName': 'AWS::CodeStarConnections::Connection',
+            'RequestToken': '25',
+        }
+
+        response = {
+            'status': 'CANCEL_COMPLETE',
+            'resource_type': 'AWS::CodeStarConnections::Connection',
+            'is_complete': True,
+            'request_token': '25',
+        }
+
+        assert progress_event(request, None) == response
+
     async def test_progress_event_empty_list_chooses_status_message(self):
         """Testing mapping progress event."""
         request = {
@@ -199,3 +229,103 @@ class TestUtils:
         }
 
         assert progress_event(request, [hook]) == response
+
+    async def test_to_json(self):
+        """Testing serializing a document for CloudControl."""
+        assert (
+            to_json([{'op': 'replace', 'path': '/RetentionInDays', 'value': 90}])
+            == '[{"op":"replace","path":"/RetentionInDays","value":90}]'
+        )
+
+    async def test_to_json_big_integer(self):
+        """Testing integers wider than 64 bits are still serialized."""
+        assert to_json({'N': 2**64}) == '{"N":18446744073709551616}'
+
+    async def test_from_json(self):
+        """Testing parsing a schema document."""
+        assert from_json('{"typeName": "AWS::Logs::LogGroup"}') == {
+            'typeName': 'AWS::Logs::LogGroup'
+        }
+        with pytest.raises(json.JSONDecodeError):
+            from_json('{"typeName"')
+
+    @patch.object(cloud_control_utils.asyncio, 'sleep', new_callable=AsyncMock)
+    async def test_wait_for_request(self, mock_sleep):
+        """Testing polling backs off until the request completes."""
+        statuses = ['PENDING', 'IN_PROGRESS', 'IN_PROGRESS', 'SUCCESS']
+        mock_client = MagicMock()
+        mock_client.get_resource_request_status.side_effect = [
+            {'ProgressEvent': {'OperationStatus': status}} for status in statuses
+        ]
+
+        result = await wait_for_request(mock_client, 'token', 300)
+
+        assert result == {'ProgressEvent': {'OperationStatus': 'SUCCESS'}}
+        assert mock_client.get_resource_request_status.call_count == 4
+        sleeps = [c.args[0] for c in mock_sleep.call_args_list]
+        assert len(sleeps) == 3
+        for sleep, interval in zip(sleeps, (0.25, 0.5, 1.0)):
+            assert interval <= sleep <= interval * 1.1
+
+    @patch.object(cloud_control_utils.asyncio, 'sleep', new_callable=AsyncMock)
+    async def test_wait_for_request_max_interval(self, mock_sleep):
+        """Testing the poll interval is capped at the maximum interval."""
+        statuses = ['IN_PROGRESS'] * 4 + ['FAILED']
+        mock_client = MagicMock()
+        mock_client.get_resource_request_status.side_effect = [
+            {'ProgressEvent': {'OperationStatus': status}} for status in statuses
+        ]
+
+        result = await wait_for_request(
+            mock_client, 'token', 300, initial_interval=2.0, max_interval=5.0
+        )
+
+        assert result == {'ProgressEvent': {'OperationStatus': 'FAILED'}}
+        sleeps = [c.args[0] for c in mock_sleep.call_args_list]
+        assert len(sleeps) == 4
+        for sleep, interval in zip(sleeps, (2.0, 4.0, 5.0, 5.0)):
+            assert interval <= sleep <= interval * 1.1
+
+    @patch.object(cloud_control_utils.asyncio, 'sleep', new_callable=AsyncMock)
+    async def test_wait_for_request_timeout(self, mock_sleep):
+        """Testing polling stops at the timeout with the last status."""
+        mock_client = MagicMock()
+        mock_client.get_resource_request_status.return_value = {
+            'ProgressEvent': {'OperationStatus': 'IN_PROGRESS'}
+        }
+
+        result = await wait_for_request(mock_client, 'token', 0)
+
+        assert result == {'ProgressEvent': {'OperationStatus': 'IN_PROGRESS'}}
+        mock_sleep.assert_not_called()
+
+    @patch.object(cloud_control_utils.asyncio, 'sleep', new_callable=AsyncMock)
+    async def test_wait_for_request_cancelled(self, mock_sleep):
+        """Testing polling stops once a cancellation has completed."""
+        statuses = ['IN_PROGRESS', 'CANCEL_IN_PROGRESS', 'CANCEL_COMPLETE']
+        mock_client = MagicMock()
+        mock_client.get_resource_request_status.side_effect = [
+            {'ProgressEvent': {'OperationStatus': status}} for status in statuses
+        ]
+
+        result = await wait_for_request(mock_client, 'token', 300)
+
+        assert result == {'ProgressEvent': {'OperationStatus': 'CANCEL_COMPLETE'}}
+        assert mock_client.get_resource_request_status.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch.object(cloud_control_utils, 'time')
+    @patch.object(cloud_control_utils.asyncio, 'sleep', new_callable=AsyncMock)
+    async def test_wait_for_request_deadline(self, mock_sleep, mock_time):
+        """Testing the last sleep is clipped to the deadline and polling stops once it passes."""
+        mock_time.monotonic.side_effect = [0.0, 0.9, 2.0]
+        mock_client = MagicMock()
+        mock_client.get_resource_request_status.return_value = {
+            'ProgressEvent': {'OperationStatus': 'IN_PROGRESS'}
+        }
+
+        result = await wait_for_request(mock_client, 'token', 1)
+
+        assert result == {'ProgressEvent': {'OperationStatus': 'IN_PROGRESS'}}
+        assert mock_client.get_resource_request_status.call_count == 2
+        mock_sleep.assert_called_once_with(pytest.approx(0.1))
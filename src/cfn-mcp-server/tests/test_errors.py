@@ -14,10 +14,9 @@
 """Tests for the cfn MCP Server."""
 
 import pytest
-from awslabs.cfn_mcp_server.errors import handle_aws_api_error
+from awslabs.cfn_mcp_server.errors import ClientError, handle_aws_api_error, map_aws_api_errors
 
 
-@pytest.mark.asyncio
 class TestErrors:
     """Tests on the errors module."""
 
@@ -98,3 +97,25 @@ class TestErrors:
         error = Exception('none of the above')
         mapped = handle_aws_api_error(error)
         assert mapped.message.startswith('An error occurred')  # pyright: ignore[reportAttributeAccessIssue]
+
+    async def test_map_aws_api_errors(self):
+        """Testing decorated tools map AWS exceptions."""
+
+        @map_aws_api_errors
+        async def tool():
+            raise Exception('ThrottlingException')
+
+        with pytest.raises(ClientError, match='Request was throttled'):
+            await tool()
+
+    async def test_map_aws_api_errors_passes_client_errors(self):
+        """Testing decorated tools keep errors that were already mapped."""
+        error = ClientError('Please provide a resource type')
+
+        @map_aws_api_errors
+        async def tool():
+            raise error
+
+        with pytest.raises(ClientError) as raised:
+            await tool()
+        assert raised.value is error
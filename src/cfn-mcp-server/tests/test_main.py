@@ -13,6 +13,9 @@
 # limitations under the License.
 """Tests for the main function in server.py."""
 
+import pytest
+from awslabs.cfn_mcp_server import server
+from awslabs.cfn_mcp_server.context import Context
 from awslabs.cfn_mcp_server.server import main
 from unittest.mock import patch
 
@@ -20,15 +23,33 @@ from unittest.mock import patch
 class TestMain:
     """Tests for the main function."""
 
-    @patch('awslabs.cfn_mcp_server.server.mcp.run')
-    @patch('sys.argv', ['awslabs.cfn-mcp-server'])
-    def test_main_default(self, mock_run):
-        """Test main function with default arguments."""
+    @pytest.mark.parametrize(
+        ('flags', 'readonly'),
+        [
+            pytest.param([], False, id='default'),
+            pytest.param(['--readonly'], True, id='readonly'),
+            pytest.param(['--no-readonly'], False, id='no_readonly'),
+        ],
+    )
+    @patch.object(server, 'executor')
+    @patch.object(server, 'warm_executor')
+    @patch.object(server.mcp, 'run')
+    def test_main(self, mock_run, mock_warm_executor, mock_executor, monkeypatch, flags, readonly):
+        """Test main function with and without readonly mode."""
+        monkeypatch.setattr('sys.argv', ['awslabs.cfn-mcp-server', *flags])
+        # main() replaces the context singleton, restore it afterwards for the other tests
+        monkeypatch.setattr(Context, '_instance', None)
+
         # Call the main function
         main()
 
-        # Check that mcp.run was called with the correct arguments
+        # Check that mcp.run was called and the readonly flag reached the context
         mock_run.assert_called_once()
+        assert bool(Context.readonly_mode()) is readonly
+
+        # Check that the executor was warmed up before the server ran and shut down after it
+        mock_warm_executor.assert_called_once_with()
+        mock_executor.shutdown.assert_called_once_with(cancel_futures=True)
 
     def test_module_execution(self):
         """Test the module execution when run as __main__."""
@@ -37,7 +58,6 @@ class TestMain:
 
         # Get the source code of the module
         import inspect
-        from awslabs.cfn_mcp_server import server
 
         # Get the source code
         source = inspect.getsource(server)
@@ -16,15 +16,22 @@
 import pytest
 import random
 import string
+from awslabs.cfn_mcp_server import schema_manager as schema_manager_module
 from awslabs.cfn_mcp_server.schema_manager import schema_manager
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
+
+
+@pytest.fixture
+def mock_get_aws_client(monkeypatch):
+    """Mock the get_aws_client function."""
+    mock = MagicMock()
+    monkeypatch.setattr(schema_manager_module, 'get_aws_client', mock)
+    return mock
 
 
-@pytest.mark.asyncio
 class TestSchemaManager:
     """Tests on the schema_manager module."""
 
-    @patch('awslabs.cfn_mcp_server.schema_manager.get_aws_client')
     async def test_download_schema(self, mock_get_aws_client):
         """Testing getting a schema from download."""
         # Setup the mock
@@ -44,7 +51,6 @@ class TestSchemaManager:
         result = await sm.get_schema(type_name)
         assert result['properties'] == {}
 
-    @patch('awslabs.cfn_mcp_server.schema_manager.get_aws_client')
     async def test_load_schema(self, mock_get_aws_client):
         """Testing testing a schema that was already in the registry."""
         # Setup the mock
@@ -64,3 +70,8 @@ class TestSchemaManager:
         result1 = await sm.get_schema(type_name)
         result2 = await sm.get_schema(type_name)
         assert result1 == result2
+        mock_cfn_client.describe_type.assert_called_once()
+
+    async def test_singleton(self):
+        """Testing the schema manager is created once."""
+        assert schema_manager() is schema_manager()